@@ -14,9 +14,13 @@ Functions:
     int2char: Reverse of char2int.
     count_clues: Given a string or 2D array representing a puzzle, return
         the number of starting clues in the puzzle.
+    mask_to_set: Convert a bitmask of cell values to the equivalent set.
+    mask_count: Count the cell values in a bitmask.
     from_string: Given a string representing a puzzle, return the 2D array
         equivalent. All class methods expect the array version.
 """
+import functools
+
 
 DEFAULT_PUZZLE_SIZE = 9
 EMPTY_CELL = None
@@ -31,6 +35,27 @@ CELL_VALUES = "123456789ABCDEFGHIJKLMNOP"
 
 assert MAX_PUZZLE_SIZE == len(CELL_VALUES)
 
+# Lookup tables for char2int and int2char
+_INT2CHAR = "." + CELL_VALUES
+_CHAR2INT = {ch: i + 1 for i, ch in enumerate(CELL_VALUES)}
+_CHAR2INT["."] = _CHAR2INT["0"] = EMPTY_CELL
+
+# bytes.translate tables between cell characters and cell values, with zero
+# for an empty cell. Characters that are not cell values translate to _BAD_CHAR.
+_BAD_CHAR = 0xFF
+_CHAR_TO_VALUE = bytes(
+    (_CHAR2INT[chr(c)] or 0) if chr(c) in _CHAR2INT else _BAD_CHAR for c in range(256)
+)
+_VALUE_TO_CHAR = _INT2CHAR.encode().ljust(256, b"?")
+
+# Cell labels used by __str__, indexed by cell value ("-" for an empty cell)
+_VALUE_TO_LABEL = ("-",) + tuple(str(v) for v in range(MIN_CELL_VALUE, MAX_PUZZLE_SIZE + 1))
+
+# complete_set for each grid size, shared between puzzles of that size
+_COMPLETE_SETS = tuple(
+    frozenset(range(MIN_CELL_VALUE, i + 1)) for i in range(MAX_PUZZLE_SIZE + 1)
+)
+
 
 def build_empty_grid(grid_size):
     """Builds a 2D array grid_size * grid_size, each cell element is None."""
@@ -42,24 +67,112 @@ def build_empty_grid(grid_size):
 
 
 def char2int(char):
-    """Converts character char to an int representation."""
-    if char in (".", "0"):
-        return EMPTY_CELL
-    return CELL_VALUES.index(char) + 1
+    """Converts character char to an int representation.
+
+    Raises:
+        ValueError: char is not a single cell character (or '.'/'0').
+    """
+    try:
+        return _CHAR2INT[char]
+    except KeyError:
+        raise ValueError(f"{char!r} is not a valid cell character") from None
 
 
 def int2char(value):
     """Converts back from an int value to character value for a cell."""
-    if not value:
-        return "."
-    return CELL_VALUES[value - 1]
+    return _INT2CHAR[value or 0]
+
+
+def mask_to_set(mask):
+    """Converts a bitmask of cell values to a set of ints.
+
+    Constraints are tracked as integer bitmasks, where bit 0 represents
+    the value 1, bit 1 the value 2, and so on.
+    """
+    ret = set()
+    value = MIN_CELL_VALUE
+    while mask:
+        if mask & 1:
+            ret.add(value)
+        mask >>= 1
+        value += 1
+    return ret
+
+
+def _has_repeats(cells):
+    """Returns True if a non-empty value is repeated in cells.
+
+    cells is a slice of the flat grid (e.g. a row or column), with zero for
+    empty cells. Counting and the set are built in C, so there is no per-cell
+    Python work.
+    """
+    values = set(cells)
+    values.discard(0)
+    return len(values) != len(cells) - cells.count(0)
+
+
+def mask_count(mask):
+    """Counts the cell values in a bitmask (i.e. the number of bits set)."""
+    return bin(mask).count("1")
+
+
+if hasattr(int, "bit_count"):
+    # Python 3.10+ has a builtin popcount
+    mask_count = int.bit_count  # noqa: F811
+
+
+@functools.lru_cache(maxsize=None)
+def _line_slices(grid_size):
+    """Returns (row_slices, column_slices) of the flat grid, indexed by row or column number."""
+    n = grid_size
+    rows = tuple(slice(x * n, x * n + n) for x in range(n))
+    cols = tuple(slice(y, n * n, n) for y in range(n))
+    return rows, cols
 
 
 def count_clues(puzzle_grid):
     """Counts clues in a puzzle_grid, which can be a list of lists or string."""
+    # Count the empty cells with C-level count() calls rather than testing
+    # each cell. Empty cells may be None or 0 in a grid, "." or "0" in a string.
     if isinstance(puzzle_grid, list):
-        return sum([1 for sublist in puzzle_grid for i in sublist if i])
-    return len(puzzle_grid) - puzzle_grid.count(".")
+        return sum(len(row) - row.count(EMPTY_CELL) - row.count(0) for row in puzzle_grid)
+    return len(puzzle_grid) - puzzle_grid.count(".") - puzzle_grid.count("0")
+
+
+def _string_to_values(puzzle_string):
+    """Converts a puzzle string to its size and a flat bytes of cell values.
+
+    Decoding is a single bytes.translate() call rather than a char2int() call
+    per character. See from_string for the string format and errors raised.
+
+    Returns:
+        Tuple of (grid_size, values), where values has one byte per cell in
+        row order and zero for an empty cell.
+    """
+    s = puzzle_string.rstrip()
+    grid_size = int(len(s) ** (1 / 2))
+
+    if not MIN_PUZZLE_SIZE <= grid_size <= MAX_PUZZLE_SIZE:
+        raise ValueError(f"puzzle_string {grid_size}x{grid_size} is out of range")
+
+    if grid_size ** 2 != len(s):
+        raise ValueError(f"puzzle_string {grid_size}x{grid_size} is not a square")
+
+    values = s.encode("ascii", "replace").translate(_CHAR_TO_VALUE)
+    if max(values) > grid_size:
+        i = next(i for i, v in enumerate(values) if v > grid_size)
+        if values[i] == _BAD_CHAR:
+            raise ValueError(f"Cell value {s[i]!r} at {i} is not a valid character")
+        raise ValueError(f"Cell value {values[i]} at {i} out of range [1:{grid_size}]")
+
+    return grid_size, values
+
+
+def _starting_grid_size(starting_grid):
+    """Returns the grid size of a starting grid (2D array or string), or 0 if none."""
+    if isinstance(starting_grid, str):
+        return _string_to_values(starting_grid)[0]
+    return len(starting_grid) if starting_grid else 0
 
 
 def from_string(puzzle_string):
@@ -81,22 +194,11 @@ def from_string(puzzle_string):
         ValueError: puzzle_string length is not a square (e.g. 4, 9, 16, 25);
             or a character value in string is out of range.
     """
-    s = puzzle_string.rstrip()
-    grid_size = int(len(s) ** (1 / 2))
-
-    if not MIN_PUZZLE_SIZE <= grid_size <= MAX_PUZZLE_SIZE:
-        raise ValueError(f"puzzle_string {grid_size}x{grid_size} is out of range")
-
-    if grid_size ** 2 != len(s):
-        raise ValueError(f"puzzle_string {grid_size}x{grid_size} is not a square")
-
+    grid_size, values = _string_to_values(puzzle_string)
     ret = build_empty_grid(grid_size)
-    for i, ch in enumerate(s):
-        v = char2int(ch)
-        if v and MIN_CELL_VALUE <= v <= grid_size:
+    for i, v in enumerate(values):
+        if v:
             ret[i // grid_size][i % grid_size] = v
-        elif v:
-            raise ValueError(f"Cell value {v} at {i} out of range [1:{grid_size}]")
 
     return ret
 
@@ -116,12 +218,14 @@ class LatinSquare:
         num_cells: Total number of cells (grid_size * grid_size)
         max_value: Equal to grid_size, it's the max value of a cell, and
             also the grid's length and height.
-        complete_set: Set of values from [1..max_value] that must exist once
-            in each row and column in a solved puzzle.
+        complete_set: Frozen set of values from [1..max_value] that must exist
+            once in each row and column in a solved puzzle.
+        complete_mask: Bitmask equivalent of complete_set (bit 0 is value 1).
 
     Args:
-        starting_grid: A list of lists of integers (2D array of ints).
-            Pass None to start with an empty grid.
+        starting_grid: A list of lists of integers (2D array of ints), or a
+            string as accepted by from_string. Pass None to start with an
+            empty grid.
         grid_size: The number of cells for the width and height of the
             grid. Default value is 9, for a 9x9 grid (81 cells). If not
             set, size is set to len(starting_grid), otherwise must be
@@ -134,12 +238,14 @@ class LatinSquare:
 
     def __init__(self, grid_size=None, starting_grid=None):
 
-        # If a starting_grid is passed, that sets the size
-        if starting_grid and grid_size:
-            if len(starting_grid) != grid_size:
+        # If a starting_grid is passed, that sets the size. Strings are left
+        # as is, init_puzzle decodes them directly.
+        starting_size = _starting_grid_size(starting_grid)
+        if starting_size and grid_size:
+            if starting_size != grid_size:
                 raise ValueError(f"starting_grid is not {grid_size}x{grid_size}")
-        elif starting_grid:
-            grid_size = len(starting_grid)
+        elif starting_size:
+            grid_size = starting_size
         elif grid_size is None:
             grid_size = DEFAULT_PUZZLE_SIZE
 
@@ -152,52 +258,63 @@ class LatinSquare:
         self.size = (grid_size, grid_size)
         self.num_cells = grid_size * grid_size
         self.max_value = grid_size
-        self.complete_set = set(range(MIN_CELL_VALUE, grid_size + 1))
+        self.complete_set = _COMPLETE_SETS[grid_size]
+        self.complete_mask = (1 << grid_size) - 1
 
-        # Protected
-        self._grid = build_empty_grid(grid_size)
+        # Protected. Cells are stored row by row in a flat bytearray, with
+        # zero marking an empty cell (the cell at x,y is at x * max_value + y)
+        self._grid = bytearray(self.num_cells)
+        self._row_slices, self._col_slices = _line_slices(grid_size)
         self.__num_empty_cells = grid_size * grid_size
+        self.__solved_grid = None
 
-        # Initialize constraints
-        self.__allowed_values_for_row = [
-            set(self.complete_set) for i in range(grid_size)
-        ]
-        self.__allowed_values_for_col = [
-            set(self.complete_set) for i in range(grid_size)
-        ]
+        # Initialize constraints. Each is a bitmask of the values already
+        # used in that row or column (bit 0 is value 1).
+        self.__used_in_row = [0] * grid_size
+        self.__used_in_col = [0] * grid_size
 
         # Accept a starting puzzle
-        if starting_grid:
+        if starting_size:
             self.init_puzzle(starting_grid)
 
     def init_puzzle(self, starting_grid):
         """Initializes a puzzle grid based on contents of starting_grid.
 
         Clears the existing puzzle and resets internal state (e.g. count of
-        empty cells remaining).
+        empty cells remaining). The size of starting_grid is checked first, so
+        a grid of the wrong size leaves the puzzle unchanged.
 
         Args:
-            starting_grid: A list of lists of integers (2D array of ints).
-                To help catch data errors, must be the same size as what the
-                instance was initialized for.
+            starting_grid: A list of lists of integers (2D array of ints), or
+                a string as accepted by from_string. To help catch data
+                errors, must be the same size as what the instance was
+                initialized for.
 
         Raises:
             ValueError: Size of starting_grid (len) is not what was expected
                 from the initial grid_size; or constraint on cell values is
                 violated (e.g. dupicate value in a row)
         """
-        self.clear_all()
-
-        # Check that new grid is correct number of rows
-        if len(starting_grid) != self.max_value:
-            raise ValueError(f"Exepect {self.max_value} rows, got {len(starting_grid)}")
+        n = self.max_value
+        if isinstance(starting_grid, str):
+            grid_size, values = _string_to_values(starting_grid)
+            if grid_size != n:
+                raise ValueError(f"Expect a {n}x{n} puzzle string, got {grid_size}x{grid_size}")
+            self.clear_all()
+            for i, v in enumerate(values):
+                if v:
+                    self.set(i // n, i % n, v)
+            return
 
-        # Check that new grid has correct number of cols
+        # Check that new grid is correct number of rows and cols
+        if len(starting_grid) != n:
+            raise ValueError(f"Exepect {n} rows, got {len(starting_grid)}")
         for x, row in enumerate(starting_grid):
-            if len(row) != self.max_value:
-                raise ValueError(
-                    f"Expect {self.max_value} columns in row {x}, got {len(row)}")
+            if len(row) != n:
+                raise ValueError(f"Expect {n} columns in row {x}, got {len(row)}")
 
+        self.clear_all()
+        for x, row in enumerate(starting_grid):
             for y, val in enumerate(row):
                 if val:
                     self.set(x, y, val)
@@ -206,9 +323,20 @@ class LatinSquare:
         """Returns the number of empty cells remaining."""
         return self.__num_empty_cells
 
+    def _cell_index(self, x, y):
+        """Returns the index of cell x,y in the flat grid
+
+        Raises:
+            IndexError: x,y location out of range [0:max_value-1]
+        """
+        n = self.max_value
+        if not (0 <= x < n and 0 <= y < n):
+            raise IndexError(f"Cell {x},{y} out of range [0:{n - 1}]")
+        return x * n + y
+
     def get(self, x, y):
         """Returns the cell value at (x, y)"""
-        return self._grid[x][y]
+        return self._grid[self._cell_index(x, y)] or EMPTY_CELL
 
     def set(self, x, y, value):
         """Sets the call at x,y to value
@@ -228,62 +356,104 @@ class LatinSquare:
         """
         if value < MIN_CELL_VALUE or value > self.max_value:
             raise ValueError(f"Value {value} out of range [{MIN_CELL_VALUE}:{self.max_value}]")
-
-        if self._grid[x][y] == value:
+        n = self.max_value
+        if not (0 <= x < n and 0 <= y < n):
+            raise IndexError(f"Cell {x},{y} out of range [0:{n - 1}]")
+        i = x * n + y
+        if self._grid[i] == value:
             return
 
+        # Check before clearing any previous value, so a rejected value leaves
+        # the cell as it was. The previous value's own bit is the only one
+        # clearing would remove, and it can't be this value's bit.
+        bit = 1 << (value - 1)
+        if self._used_mask(x, y) & bit:
+            raise ValueError(f"Value {value} not allowed at {x},{y}")
+
         # Clear value first to update constraints
-        if self._grid[x][y]:
+        if self._grid[i]:
             self.clear(x, y)
 
-        # Write value if allowed
-        if value in self.get_allowed_values(x, y):
-            self._grid[x][y] = value
-            self.__num_empty_cells -= 1
-        else:
-            raise ValueError(f"Value {value} not allowed at {x},{y}")
+        self._grid[i] = value
+        self.__num_empty_cells -= 1
 
         # Update constraints
-        self.__allowed_values_for_row[x].remove(value)
-        self.__allowed_values_for_col[y].remove(value)
+        self.__used_in_row[x] |= bit
+        self.__used_in_col[y] |= bit
 
     def clear(self, x, y):
-        """Clears the value for a cell at x,y and update constraints"""
+        """Clears the value for a cell at x,y and update constraints
+
+        Raises:
+            IndexError: x,y location out of range [0:max_value-1]
+        """
 
         # Is OK to "clear" an already empty cell (no-op)
-        if self._grid[x][y] == EMPTY_CELL:
+        n = self.max_value
+        if not (0 <= x < n and 0 <= y < n):
+            raise IndexError(f"Cell {x},{y} out of range [0:{n - 1}]")
+        i = x * n + y
+        prev = self._grid[i]
+        if not prev:
             return
 
-        # Stash previous value before clearing, to update constraints
-        prev = self._grid[x][y]
-        self._grid[x][y] = EMPTY_CELL
+        # Previous value was stashed before clearing, to update constraints
+        self._grid[i] = 0
         self.__num_empty_cells += 1
 
-        # Put previous value back into allowed list
-        self.__allowed_values_for_row[x].add(prev)
-        self.__allowed_values_for_col[y].add(prev)
+        # Previous value is allowed again in this row and column
+        bit = ~(1 << (prev - 1))
+        self.__used_in_row[x] &= bit
+        self.__used_in_col[y] &= bit
 
     def clear_all(self):
-        """Clears the entire puzzle grid"""
-        for x in range(self.max_value):
-            for y in range(self.max_value):
-                self.clear(x, y)
+        """Clears the entire puzzle grid
+
+        Resets the grid and constraints in one go, rather than clearing each
+        cell in turn. Everything is reset in place, so no storage is
+        reallocated. Subclasses with extra constraints must reset them too.
+        """
+        self._grid[:] = bytes(self.num_cells)
+        self.__num_empty_cells = self.num_cells
+        self.__used_in_row[:] = [0] * self.max_value
+        self.__used_in_col[:] = [0] * self.max_value
+
+    def copy(self):
+        """Returns a new puzzle with the same cell values and constraints.
+
+        All internal state is ints held in lists or a bytearray, so slice
+        copies are enough -- much cheaper than copy.deepcopy.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._grid = self._grid[:]
+        new.__used_in_row = self.__used_in_row[:]
+        new.__used_in_col = self.__used_in_col[:]
+        return new
+
+    def __copy__(self):
+        """Supports copy.copy(), using copy() so the grid is never shared."""
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        """Supports copy.deepcopy(), using the copy() fast path."""
+        return self.copy()
 
     def is_empty(self, x, y):
         """Returns True if the cell is empty"""
-        return self._grid[x][y] == EMPTY_CELL
+        return not self._grid[self._cell_index(x, y)]
 
     def find_empty_cell(self):
         """Returns the next empty cell as tuple (x, y)
 
         Search starts at 0,0 and continues along the row. Returns at the first
-        empty cell found. Returns empty tuple if no empty cells left.
+        empty cell found. Returns empty tuple if no empty cells left. The
+        result is a new tuple, so callers can keep it without copying.
         """
-        for x, row in enumerate(self._grid):
-            for y, v in enumerate(row):
-                if not v:
-                    return (x, y)
-        return ()
+        i = self._grid.find(0)
+        if i < 0:
+            return ()
+        return divmod(i, self.max_value)
 
     def next_empty_cell(self):
         """Generator that returns the next empty cell that exists in the grid
@@ -293,12 +463,20 @@ class LatinSquare:
         (assuming this is being called as a generator function). Returns an
         empty tuple at the end of the list.
         """
-        for x, row in enumerate(self._grid):
-            for y, v in enumerate(row):
-                if not v:
-                    yield (x, y)
+        i = self._grid.find(0)
+        while i >= 0:
+            yield divmod(i, self.max_value)
+            i = self._grid.find(0, i + 1)
         return ()
 
+    def get_all_empty_cells(self):
+        """Returns all empty cells as a tuple of (x, y) tuples
+
+        The result is an immutable snapshot, so callers can keep or share it
+        without copying. It is not updated as cells are set or cleared.
+        """
+        return tuple(self.next_empty_cell())
+
     def next_best_empty_cell(self):
         """Generator method that returns the next "best" empty cell
 
@@ -307,32 +485,101 @@ class LatinSquare:
         """
         max_possibilities = 1
         while max_possibilities <= self.max_value:
-            for x, row in enumerate(self._grid):
-                for y, v in enumerate(row):
-                    if not v and len(self.get_allowed_values(x, y)) <= max_possibilities:
-                        yield (x, y)
+            for x, y in self.next_empty_cell():
+                if mask_count(self.get_allowed_mask(x, y)) <= max_possibilities:
+                    yield (x, y)
 
             max_possibilities += 1
         return ()
 
+    def get_mrv_cell(self):
+        """Returns an empty cell with the fewest allowed values as tuple (x, y)
+
+        This is the "minimum remaining values" heuristic. Searching from 0,0
+        along the rows, returns the first cell with at most one allowed value
+        as soon as it is found (a later cell with none is not looked for);
+        otherwise the first cell with the fewest allowed values. Returns empty
+        tuple if no empty cells left.
+        """
+        # Fewest allowed values is the same as the most values used by the
+        # cell's constraints, which saves complementing each mask
+        grid = self._grid
+        n = self.max_value
+        used_mask = self._used_mask
+        best = ()
+        most_used = -1
+        i = grid.find(0)
+        while i >= 0:
+            x, y = divmod(i, n)
+            used = mask_count(used_mask(x, y))
+            if used > most_used:
+                best = (x, y)
+                most_used = used
+                if used >= n - 1:
+                    break
+            i = grid.find(0, i + 1)
+        return best
+
+    def get_cell_values(self):
+        """Return every cell value as bytes, row by row, with 0 for empty cells
+
+        The result is an immutable snapshot of the grid, so it is cheap to
+        compare against another puzzle or keep for later.
+        """
+        return bytes(self._grid)
+
     def get_row_values(self, x):
         """Return the list of set values from row x as a list"""
-        return [i for i in self._grid[x] if i != EMPTY_CELL]
+        return list(self._grid[self._row_slices[x]].translate(None, b"\0"))
 
     def get_column_values(self, y):
         """Return the list of set values from column y as a list"""
-        return [i[y] for i in self._grid if i[y] != EMPTY_CELL]
+        return list(self._grid[self._col_slices[y]].translate(None, b"\0"))
+
+    def _used_mask(self, x, y):
+        """Returns a bitmask of the values that constrain the cell at x,y
+
+        Subclasses with additional constraints (e.g. Sudoku boxes) extend
+        this to include them.
+        """
+        return self.__used_in_row[x] | self.__used_in_col[y]
+
+    def get_allowed_mask(self, x, y):
+        """Returns the current allowed values at x,y as a bitmask
+
+        Bit 0 is the value 1, bit 1 the value 2, and so on. This is every value
+        not already used by the constraints on the cell (the same row and
+        column, plus any constraints added by subclasses). If there is already
+        a value in a cell, then it is the only allowed value.
+
+        Cheaper than get_allowed_values when the caller only needs to test
+        for a value (mask & (1 << (value - 1))) or count the values.
+        """
+        value = self._grid[x * self.max_value + y]
+        if value:
+            return 1 << (value - 1)
+        return self.complete_mask & ~self._used_mask(x, y)
+
+    def is_allowed_value(self, x, y, value):
+        """Returns True if value is currently allowed at x,y
+
+        Same rules as get_allowed_mask, but tests the one value directly
+        against the constraint masks without building anything.
+        """
+        current = self._grid[x * self.max_value + y]
+        if current:
+            return current == value
+        return not self._used_mask(x, y) & (1 << (value - 1))
 
     def get_allowed_values(self, x, y):
         """Returns the current set of allowed values at x,y as a set
 
-        This is based on the intersection of the sets of allowed values for
-        the same row and column. If there is already a value in a cell, then
-        it is the only allowed value.
+        See get_allowed_mask for the rules applied.
         """
-        if self._grid[x][y]:
-            return {self._grid[x][y]}
-        return self.__allowed_values_for_row[x] & self.__allowed_values_for_col[y]
+        value = self._grid[x * self.max_value + y]
+        if value:
+            return {value}
+        return mask_to_set(self.complete_mask & ~self._used_mask(x, y))
 
     def is_valid(self):
         """Returns True if the puzzle is in a valid state, False if rules broken.
@@ -345,35 +592,42 @@ class LatinSquare:
         Empty cells are allowed -- this is not checking that the puzzle is
         solved.
         """
-        for x in range(self.max_value):
-            values = self.get_row_values(x)
-            if len(values) != len(set(values)):
+        grid = self._grid
+        for row in self._row_slices:
+            if _has_repeats(grid[row]):
                 return False
 
-        for y in range(self.max_value):
-            values = self.get_column_values(y)
-            if len(values) != len(set(values)):
+        for col in self._col_slices:
+            if _has_repeats(grid[col]):
                 return False
 
         return True
 
     def is_solved(self):
-        """Returns True if there are no empty cells left, and the puzzle is valid"""
-        if self.is_valid():
-            for i in range(self.max_value):
-                for j in range(self.max_value):
-                    if self.is_empty(i, j):
-                        return False
-            return True
-        return False
+        """Returns True if there are no empty cells left, and the puzzle is valid
+
+        The last grid found to be solved is remembered, so asking again (e.g.
+        when rendering) only compares the grid rather than re-validating it.
+        """
+        if self.__num_empty_cells:
+            return False
+        grid = bytes(self._grid)
+        if grid != self.__solved_grid:
+            if not self.is_valid():
+                return False
+            self.__solved_grid = grid
+        return True
 
     def __str__(self):
         """Return a string representation of the puzzle as a 2D grid"""
-        blurb = [["-" if v is None else v for v in row] for row in self._grid]
-        return "\n".join(" ".join(map(str, sl)) for sl in blurb)
+        n = self.max_value
+        grid = self._grid
+        return "\n".join(
+            " ".join([_VALUE_TO_LABEL[v] for v in grid[i:i + n]]) for i in range(0, self.num_cells, n)
+        )
 
     def __repr__(self):
         """Return an unambiguous string representation of the puzzle"""
-        puz = "".join([int2char(i) for sublist in self._grid for i in sublist])
+        puz = self._grid.translate(_VALUE_TO_CHAR).decode()
         ret = f"{self.__class__.__name__}({self.max_value}, '{puz}')"
         return ret
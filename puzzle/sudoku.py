@@ -32,13 +32,21 @@ Classes:
 """
 import sys
 import collections
+import functools
 import pycosat
 
-from puzzle.latinsquare import LatinSquare, from_string, build_empty_grid
+from puzzle.latinsquare import LatinSquare, MAX_PUZZLE_SIZE, from_string, mask_count, mask_to_set
+from puzzle.latinsquare import _starting_grid_size
 
 
 DEFAULT_SUDOKU_SIZE = 9
 
+# Fragments used by SudokuPuzzle.as_html
+_HTML_ROW_OPEN = "<tr><td>"
+_HTML_CELL_SEP = "</td><td>"
+_HTML_ROW_CLOSE = "</td></tr>"
+_HTML_VALUES = tuple(str(v) for v in range(MAX_PUZZLE_SIZE + 1))
+
 def _log(msg):
     """Print a log message on stderr - called by solver methods.
 
@@ -48,6 +56,57 @@ def _log(msg):
     print(msg, file=sys.stderr)
 
 
+def _single_value(mask):
+    """Returns the value if mask has exactly one bit set, otherwise 0."""
+    if mask and not mask & (mask - 1):
+        return mask.bit_length()
+    return 0
+
+
+# Lookup tables below depend only on the grid size, so each is built once
+# and shared by every puzzle of that size. Cell indexes are x * grid_size + y.
+@functools.lru_cache(maxsize=None)
+def _box_tables(grid_size):
+    """Returns (box_of_cell, box_cells): the box of each cell index, and each box's cell indexes."""
+    box_size = int(grid_size ** (1 / 2))
+    box_of_cell = tuple(
+        (x // box_size) * box_size + y // box_size
+        for x in range(grid_size)
+        for y in range(grid_size)
+    )
+    box_cells = tuple(
+        tuple(i for i, b in enumerate(box_of_cell) if b == box)
+        for box in range(grid_size)
+    )
+    return box_of_cell, box_cells
+
+
+@functools.lru_cache(maxsize=None)
+def _unit_cells(grid_size):
+    """Returns the (x, y) cells of every unit, keyed by "row", "column" and "box"."""
+    _, box_cells = _box_tables(grid_size)
+    return {
+        "row": tuple(tuple((x, y) for y in range(grid_size)) for x in range(grid_size)),
+        "column": tuple(tuple((x, y) for x in range(grid_size)) for y in range(grid_size)),
+        "box": tuple(tuple(divmod(i, grid_size) for i in cells) for cells in box_cells),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _peer_cells(grid_size):
+    """Returns the (x, y) peers of each cell index: the other cells in its row, column and box."""
+    box_of_cell, box_cells = _box_tables(grid_size)
+    peers = []
+    for i in range(grid_size * grid_size):
+        x, y = divmod(i, grid_size)
+        related = set(box_cells[box_of_cell[i]])
+        related.update(range(x * grid_size, x * grid_size + grid_size))
+        related.update(range(y, grid_size * grid_size, grid_size))
+        related.discard(i)
+        peers.append(tuple(divmod(j, grid_size) for j in sorted(related)))
+    return tuple(peers)
+
+
 class SudokuPuzzle(LatinSquare):
     """Implements a Sudoku puzzle grid as a specialized LatinSquare.
 
@@ -65,8 +124,9 @@ class SudokuPuzzle(LatinSquare):
         num_cells: Total number of cells (grid_size * grid_size).
         max_value: Highest value allowed in a cell, therefore also used
             as the puzzle's width and height.
-        complete_set: Set of values from [1..max_value] that must exist once
-            in each row, column, and box in a solved puzzle.
+        complete_set: Frozen set of values from [1..max_value] that must exist
+            once in each row, column, and box in a solved puzzle.
+        complete_mask: Bitmask equivalent of complete_set (inherited).
 
     Args:
         grid_size: The width/height of the grid (default is 9). Must be a
@@ -81,16 +141,14 @@ class SudokuPuzzle(LatinSquare):
 
     def __init__(self, grid_size=None, starting_grid=None):
 
-        # Convert starting_grid
-        if isinstance(starting_grid, str):
-            starting_grid = from_string(starting_grid)
-
-        # If both parameters are passed, they need to be consistent
-        if grid_size and starting_grid:
-            if len(starting_grid) != grid_size:
+        # If both parameters are passed, they need to be consistent. Strings
+        # are left as is, init_puzzle decodes them directly.
+        starting_size = _starting_grid_size(starting_grid)
+        if grid_size and starting_size:
+            if starting_size != grid_size:
                 raise ValueError(f"starting_grid is not {grid_size}x{grid_size}")
-        elif starting_grid:
-            grid_size = len(starting_grid)
+        elif starting_size:
+            grid_size = starting_size
         elif grid_size is None:
             grid_size = DEFAULT_SUDOKU_SIZE
 
@@ -100,23 +158,23 @@ class SudokuPuzzle(LatinSquare):
             raise ValueError(f"grid_size={grid_size} is not a square number")
 
         # Start by initialising LatinSquare super, use it to calculate
-        # the box size. starting_grid has to be blank, because we're not ready
-        # to set the box constraints yet.
+        # the box size. starting_grid is not passed yet, because we're not
+        # ready to set the box constraints.
 
-        blank_grid = build_empty_grid(grid_size)
-        super().__init__(grid_size=grid_size, starting_grid=blank_grid)
+        super().__init__(grid_size=grid_size)
 
         # Super has initialised row and column constraints. Sudoku puzzles
         # have an extra constraint -- boxes cannot contain repeated values.
+        # Tracked as a bitmask of the values used in each box.
 
-        self.__allowed_values_for_box = [
-            set(self.complete_set) for i in range(grid_size)
-        ]
+        self.__used_in_box = [0] * grid_size
+        self._box_of_cell, self._box_cells = _box_tables(grid_size)
+        self._peers = _peer_cells(grid_size)
 
         # Now it's safe to copy in the starting_grid, which will update the
         # constraints on rows, columns, boxes
 
-        if starting_grid:
+        if starting_size:
             self.init_puzzle(starting_grid)
 
     def box_num_to_xy(self, i):
@@ -132,9 +190,8 @@ class SudokuPuzzle(LatinSquare):
         Returns:
             Row and column of box starting position, as tuple.
         """
-        x = (i // self.box_size) * self.box_size
-        y = (i % self.box_size) * self.box_size
-        return (x, y)
+        # Box cells are in row order, so the first is the top left
+        return divmod(self._box_cells[i][0], self.max_value)
 
     def box_xy_to_num(self, x, y):
         """Given a cell at x,y return what the sequential box number is.
@@ -144,9 +201,7 @@ class SudokuPuzzle(LatinSquare):
         Returns:
             An integer from [0:max_value-1]
         """
-        box_x = x // self.box_size
-        box_y = y // self.box_size
-        return (box_x * self.box_size) + box_y
+        return self._box_of_cell[x * self.max_value + y]
 
     def set(self, x, y, value, reason=""):
         """Sets value of cell (x,y) to value, updating constraints.
@@ -154,12 +209,14 @@ class SudokuPuzzle(LatinSquare):
         Calls the parent (LatinSquare) set method first, then updates the
         box's constraints.
         """
-        if self._grid[x][y] == value:
-            return
+        i = x * self.max_value + y
+        prev = self._grid[i]
         super().set(x, y, value)
+        if prev == value:
+            return
 
         # Update box constraints
-        self.__allowed_values_for_box[self.box_xy_to_num(x, y)].remove(value)
+        self.__used_in_box[self._box_of_cell[i]] |= 1 << (value - 1)
 
         # Log the reason, if given
         if reason:
@@ -167,47 +224,51 @@ class SudokuPuzzle(LatinSquare):
 
     def clear(self, x, y):
         """Clears the value at x,y. Will update the box constraints."""
-        if not self._grid[x][y]:
+        i = self._cell_index(x, y)
+        prev = self._grid[i]
+        if not prev:
             return
 
-        # Stash previous value, then clear cell
-        prev = self._grid[x][y]
+        # Previous value was stashed, now clear cell
         super().clear(x, y)
 
         # This value available again for this box
-        self.__allowed_values_for_box[self.box_xy_to_num(x, y)].add(prev)
-
-    def get_box_values(self, box_num):
-        """Return the list of set (non-empty) values from the box box_num."""
-        box_x, box_y = self.box_num_to_xy(box_num)
+        self.__used_in_box[self._box_of_cell[i]] &= ~(1 << (prev - 1))
 
-        # Extracts 2D array
-        values = [
-            i[box_y:box_y + self.box_size]
-            for i in self._grid[box_x:box_x + self.box_size]
-        ]
+    def clear_all(self):
+        """Clears the entire puzzle grid, including the box constraints."""
+        super().clear_all()
+        self.__used_in_box[:] = [0] * self.max_value
 
-        # Flattens list
-        return [i for sublist in values for i in sublist if i]
+    def copy(self):
+        """Returns a copy of the puzzle, including the box constraints."""
+        new = super().copy()
+        new.__used_in_box = self.__used_in_box[:]
+        return new
 
-    def get_allowed_values(self, x, y):
-        """Returns the current set of possible values at x, y.
+    def get_peers(self, x, y):
+        """Return the cells that share a row, column or box with x,y.
 
-        Set of current allowed values is based on the intersection of the sets
-        of allowed values for the same row, column and box. If there is a value
-        set in this cell, then it is the only allowed value, regardless of
-        the values of neighbouring cells.
+        These are the only cells whose allowed values change when x,y is set
+        or cleared. The cell itself is not included.
 
         Returns:
-            A set of values. Values will be within [1:max_value].
+            Tuple of (x, y) tuples, in row order.
         """
-        if self._grid[x][y]:
-            return set([self._grid[x][y]])
-        else:
-            return (
-                super().get_allowed_values(x, y)
-                & self.__allowed_values_for_box[self.box_xy_to_num(x, y)]
-            )
+        return self._peers[x * self.max_value + y]
+
+    def get_box_values(self, box_num):
+        """Return the list of set (non-empty) values from the box box_num."""
+        grid = self._grid
+        return [grid[i] for i in self._box_cells[box_num] if grid[i]]
+
+    def _used_mask(self, x, y):
+        """Returns a bitmask of the values used in the same row, column and box.
+
+        Used by the parent class's get_allowed_values and set, so the box
+        constraint is enforced along with the row and column constraints.
+        """
+        return super()._used_mask(x, y) | self.__used_in_box[self._box_of_cell[x * self.max_value + y]]
 
     def is_valid(self):
         """Returns True if the puzzle is still valid (i.e. obeys the rules).
@@ -221,14 +282,18 @@ class SudokuPuzzle(LatinSquare):
         """
 
         # We only need to check the box constraint (parent class does rows
-        # and columns already).
+        # and columns already). Rows and columns are checked first, as they
+        # are contiguous slices and cheaper to check than boxes.
+
+        if not super().is_valid():
+            return False
 
         for box in range(self.max_value):
             values = self.get_box_values(box)
             if len(values) != len(set(values)):
                 return False
 
-        return super().is_valid()
+        return True
 
     def as_html(self, show_possibilities=0):
         """Renders the current puzzle in simple HTML table.
@@ -243,30 +308,28 @@ class SudokuPuzzle(LatinSquare):
         Returns:
             String containing a HTML table.
         """
-        data = []
+        parts = []
         for x in range(self.max_value):
             row_to_show = []
-            for y in range(self.max_value):
-                if not self.is_empty(x, y):
-                    row_to_show.append(self.get(x, y))
-                elif len(self.get_allowed_values(x, y)) <= show_possibilities:
-                    row_to_show.append(self.get_allowed_values(x, y))
+            for y, value in enumerate(self._grid[self._row_slices[x]]):
+                if value:
+                    row_to_show.append(_HTML_VALUES[value])
+                    continue
+                # Only build the set of possible values if it will be shown
+                possibles = self.get_allowed_mask(x, y)
+                if mask_count(possibles) <= show_possibilities:
+                    row_to_show.append(str(mask_to_set(possibles)))
                 else:
                     row_to_show.append(" ")
-            data.append(row_to_show)
+            parts.append(_HTML_ROW_OPEN)
+            parts.append(_HTML_CELL_SEP.join(row_to_show))
+            parts.append(_HTML_ROW_CLOSE)
 
         css_class = "sudoku"
         if self.is_solved():
             css_class += " solved"
 
-        ret = '<table class="{}"><tr>{}</tr></table>'.format(
-            css_class,
-            "</tr><tr>".join(
-                "<td>{}</td>".format("</td><td>".join(str(_) for _ in row))
-                for row in data
-            ),
-        )
-        return ret
+        return f'<table class="{css_class}">{"".join(parts)}</table>'
 
 
 # SOLVERS dict is filled in by @register_solver decorator
@@ -317,15 +380,21 @@ class BacktrackingSolver:
             in the current recursive "search path".
         """
 
-        if puzzle.num_empty_cells() == 0:
+        # find_empty_cell returns an empty tuple once there are no empty cells
+        cell = puzzle.find_empty_cell()
+        if not cell:
             return True
 
         if depth > self.max_depth:
             self.max_depth = depth
 
-        x, y = puzzle.find_empty_cell()
-        for value in puzzle.get_allowed_values(x, y):
-            puzzle.set(x, y, value)
+        # Try each allowed value in ascending order, straight from the mask
+        x, y = cell
+        mask = puzzle.get_allowed_mask(x, y)
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            puzzle.set(x, y, bit.bit_length())
             if self._solve_backtracking(puzzle, depth=depth + 1):
                 return True
             else:
@@ -356,23 +425,21 @@ class ConstraintPropogationSolver(BacktrackingSolver):
             in the current recursive "search path".
         """
 
-        if puzzle.num_empty_cells() <= 0:
+        # Try the cell with the fewest possible values first
+        cell = puzzle.get_mrv_cell()
+        if not cell:
             return True
 
         if depth > self.max_depth:
             self.max_depth = depth
 
-        # Generator function will return cells with only 1 possible value
-        # first, then 2, and so on...
-
-        mtGen = puzzle.next_best_empty_cell()
-        try:
-            x, y = next(mtGen)
-        except StopIteration:
-            return True  # TODO: Not sure this is needed, we never reach here
-
-        for value in puzzle.get_allowed_values(x, y):
-            puzzle.set(x, y, value)
+        # Try each allowed value in ascending order, straight from the mask
+        x, y = cell
+        mask = puzzle.get_allowed_mask(x, y)
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            puzzle.set(x, y, bit.bit_length())
             if self._solve_backtracking(puzzle, depth=depth + 1):
                 return True
             else:
@@ -459,18 +526,26 @@ class DeductiveSolver(ConstraintPropogationSolver):
         Returns:
             The number of cells that were set on this call.
         """
-        # Keep trying until we are no longer able to solve cells
-        num_cells_updated = 1
+        # Start with the cells that already have one possible value. Setting
+        # a cell only changes the possible values of its peers, so those are
+        # the only cells that need checking again afterwards.
+        worklist = collections.deque(
+            m for m in puzzle.next_empty_cell() if _single_value(puzzle.get_allowed_mask(*m))
+        )
         total_cells_updated = 0
-        while num_cells_updated > 0:
-            num_cells_updated = 0
-            for m in puzzle.next_best_empty_cell():
-                possibles = puzzle.get_allowed_values(*m)
-                if len(possibles) == 1:
-                    (value,) = possibles
-                    puzzle.set(*m, value, f"Writing {value} at {m} because it's the only possible value left for that cell")
-                    num_cells_updated += 1
-            total_cells_updated += num_cells_updated
+        while worklist:
+            m = worklist.popleft()
+            if not puzzle.is_empty(*m):
+                continue
+            value = _single_value(puzzle.get_allowed_mask(*m))
+            if not value:
+                continue
+            puzzle.set(*m, value, f"Writing {value} at {m} because it's the only possible value left for that cell")
+            total_cells_updated += 1
+
+            for peer in puzzle.get_peers(*m):
+                if puzzle.is_empty(*peer) and _single_value(puzzle.get_allowed_mask(*peer)):
+                    worklist.append(peer)
 
         return total_cells_updated
 
@@ -504,33 +579,13 @@ class DeductiveSolver(ConstraintPropogationSolver):
 
         return total_cells_updated
 
-    # TODO: The algorithm in the next three methods is essentially the same.
-    # There must be a DRYer way in Python...
-
     def _solve_only_row_squares(self, puzzle):
         """Find cases where there is only one cell that can take a particular
         value for the row
 
         Returns number of cells solved this call.
         """
-        num_cells_updated = 0
-        for x in range(puzzle.max_value):
-            # What hasn't this row got?
-            missing = puzzle.complete_set - set(puzzle.get_row_values(x))
-
-            # How many places on this row could each missing value go?
-            for value in missing:
-                possible_cells = []
-                for y in range(puzzle.max_value):
-                    if puzzle.is_empty(x, y) and value in puzzle.get_allowed_values(x, y):
-                        possible_cells.append((x, y))
-
-                # only one possible location?
-                if len(possible_cells) == 1:
-                    num_cells_updated += 1
-                    puzzle.set(*possible_cells[0], value, f"Writing {value} at {possible_cells[0]} because {value} can't go anywhere else in row {possible_cells[0][0]}")
-
-        return num_cells_updated
+        return self._solve_only_unit_squares(puzzle, "row")
 
     def _solve_only_column_squares(self, puzzle):
         """Find cases where there is only one cell that can take a particular
@@ -538,50 +593,42 @@ class DeductiveSolver(ConstraintPropogationSolver):
 
         Returns number of cells solved this call.
         """
-        num_cells_updated = 0
-        for y in range(puzzle.max_value):
-            # What hasn't this column got?
-            missing = puzzle.complete_set - set(puzzle.get_column_values(y))
-
-            # How many places in this column could each missing value go?
-            for value in missing:
-                possible_cells = []
-                for x in range(puzzle.max_value):
-                    if puzzle.is_empty(x, y) and value in puzzle.get_allowed_values(x, y):
-                        possible_cells.append((x, y))
-
-                # Only one possible location?
-                if len(possible_cells) == 1:
-                    # print(f"Column {y} needs a {v} and it can only go here {possible_cells}", file=sys.stderr)
-                    num_cells_updated += 1
-                    puzzle.set(*possible_cells[0], value, f"Writing {value} at {possible_cells[0]} because {value} can't go anywhere else in column {possible_cells[0][1]}")
-
-        return num_cells_updated
+        return self._solve_only_unit_squares(puzzle, "column")
 
     def _solve_only_box_squares(self, puzzle):
         """Find cases where there is only one cell that can take a particular
         value for the box
 
+        Returns number of cells solved this call.
+        """
+        return self._solve_only_unit_squares(puzzle, "box")
+
+    def _solve_only_unit_squares(self, puzzle, unit_type):
+        """Find cases where there is only one cell that can take a particular
+        value for each unit of unit_type ("row", "column" or "box")
+
         Returns number of cells solved this call.
         """
         num_cells_updated = 0
-        for box in range(puzzle.max_value):
-            # What hasn't this box got?
-            missing = puzzle.complete_set - set(puzzle.get_box_values(box))
-
-            # How many places in this box could each missing value go?
-            for value in missing:
-                possible_cells = []
-                box_x, box_y = puzzle.box_num_to_xy(box)
-                for x in range(box_x, box_x + puzzle.box_size):
-                    for y in range(box_y, box_y + puzzle.box_size):
-                        if puzzle.is_empty(x, y) and value in puzzle.get_allowed_values(x, y):
-                            possible_cells.append((x, y))
+        for unit, cells in enumerate(_unit_cells(puzzle.max_value)[unit_type]):
+            # Allowed values for each empty cell in the unit (0 if filled). A
+            # value already in the unit can't be allowed in any of its empty
+            # cells, so together these are the values the unit is missing.
+            masks = [puzzle.get_allowed_mask(*m) if puzzle.is_empty(*m) else 0 for m in cells]
+            missing = 0
+            for mask in masks:
+                missing |= mask
+
+            # How many places in this unit could each missing value go?
+            for value in mask_to_set(missing):
+                bit = 1 << (value - 1)
+                possible_cells = [m for m, mask in zip(cells, masks) if mask & bit]
 
                 # Only one possible location?
                 if len(possible_cells) == 1:
                     num_cells_updated += 1
-                    puzzle.set(*possible_cells[0], value, f"Writing {value} at {possible_cells[0]} because {value} can't go anywhere else in this box")
+                    puzzle.set(*possible_cells[0], value, f"Writing {value} at {possible_cells[0]} because {value} can't go anywhere else in {unit_type} {unit}")
+                    masks = [puzzle.get_allowed_mask(*m) if puzzle.is_empty(*m) else 0 for m in cells]
 
         return num_cells_updated
 
@@ -616,26 +663,30 @@ class DeductiveSolver(ConstraintPropogationSolver):
         """Take 3 rows at a time, and find digits that are solved in 2 of them."""
 
         num_cells_updated = 0
+        bs = puzzle.box_size
+        band = range(bs)
+        line = range(puzzle.max_value)
 
         # Take 3 rows at a time (the box size)
-        for x in range(0, puzzle.max_value, puzzle.box_size):
+        for x in range(0, puzzle.max_value, bs):
+            # Fetch each row in the band once, reused for the membership tests below
+            row_values_by_i = [set(puzzle.get_row_values(x + i)) for i in band]
             solved_cells = []
-            for i in range(puzzle.box_size):
-                solved_cells += puzzle.get_row_values(x + i)
+            for row_values in row_values_by_i:
+                solved_cells += row_values
 
             # Which values appear twice, and therefore missing in 1 row only?
             counter = collections.Counter(solved_cells)
-            for val in [x for x in counter.keys() if counter[x] == puzzle.box_size - 1]:
+            for val in [x for x in counter.keys() if counter[x] == bs - 1]:
                 # Which row is missing the val? Which box?
-                rows = set(range(x, x + puzzle.box_size))
-                boxes = set(range(puzzle.box_size))
-                for i in range(puzzle.box_size):
-                    row_values = puzzle.get_row_values(x + i)
-                    if val in row_values:
+                rows = set(range(x, x + bs))
+                boxes = set(band)
+                for i in band:
+                    if val in row_values_by_i[i]:
                         rows.remove(x + i)
-                        for y in range(puzzle.max_value):
+                        for y in line:
                             if puzzle.get(x + i, y) == val:
-                                boxes.remove(y // puzzle.box_size)
+                                boxes.remove(y // bs)
 
                 # Lordy. OK, at least now we have 1 row and 3 cells which *could*
                 # take the value val. See if there is only 1 cell to put it in
@@ -646,8 +697,8 @@ class DeductiveSolver(ConstraintPropogationSolver):
                 (box,) = boxes
 
                 cells = []
-                for y in range(box * puzzle.box_size, (box * puzzle.box_size) + puzzle.box_size):
-                    if val in puzzle.get_allowed_values(row, y):
+                for y in range(box * bs, box * bs + bs):
+                    if puzzle.is_allowed_value(row, y, val):
                         cells.append((row, y))
 
                 # If there's only one cell available, it must be where val belongs
@@ -662,27 +713,30 @@ class DeductiveSolver(ConstraintPropogationSolver):
         """Take 3 cols at a time, and find digits that are solved in 2 of them."""
 
         num_cells_updated = 0
+        bs = puzzle.box_size
+        band = range(bs)
+        line = range(puzzle.max_value)
 
         # Take 3 cols at a time (the box size)
-        puzzle.box_size = puzzle.box_size
-        for y in range(0, puzzle.max_value, puzzle.box_size):
+        for y in range(0, puzzle.max_value, bs):
+            # Fetch each column in the band once, reused for the membership tests below
+            col_values_by_j = [set(puzzle.get_column_values(y + j)) for j in band]
             solved_cells = []
-            for j in range(puzzle.box_size):
-                solved_cells += puzzle.get_column_values(y + j)
+            for col_values in col_values_by_j:
+                solved_cells += col_values
 
             # Which values appear twice, and therefore missing in 1 row only?
             counter = collections.Counter(solved_cells)
-            for val in [v for v in counter.keys() if counter[v] == puzzle.box_size - 1]:
+            for val in [v for v in counter.keys() if counter[v] == bs - 1]:
                 # Which column is missing the val? Which box?
-                cols = set(range(y, y + puzzle.box_size))
-                boxes = set(range(puzzle.box_size))
-                for j in range(puzzle.box_size):
-                    col_values = puzzle.get_column_values(y + j)
-                    if val in col_values:
+                cols = set(range(y, y + bs))
+                boxes = set(band)
+                for j in band:
+                    if val in col_values_by_j[j]:
                         cols.remove(y + j)
-                        for x in range(puzzle.max_value):
+                        for x in line:
                             if puzzle.get(x, y + j) == val:
-                                boxes.remove(x // puzzle.box_size)
+                                boxes.remove(x // bs)
 
                 # Lordy. OK, at least now we have 1 column and 3 cells which *could*
                 # take the value val. See if there is only 1 cell to put it in
@@ -693,8 +747,8 @@ class DeductiveSolver(ConstraintPropogationSolver):
                 (box,) = boxes
 
                 cells = []
-                for x in range(box * puzzle.box_size, (box * puzzle.box_size) + puzzle.box_size):
-                    if val in puzzle.get_allowed_values(x, col):
+                for x in range(box * bs, box * bs + bs):
+                    if puzzle.is_allowed_value(x, col, val):
                         cells.append((x, col))
 
                 # If there's only one cell available, it must be where val belongs
@@ -771,7 +825,7 @@ class SATSolver:
 
         for m in puzzle.next_empty_cell():
             val = read_cell(*m)
-            puzzle.set(*m, f"Writing {val} to {m} because it's in the SAT solution set")
+            puzzle.set(*m, val, f"Writing {val} to {m} because it's in the SAT solution set")
 
         return puzzle.is_solved()
 
@@ -16,7 +16,6 @@ Functions:
         random solution trying to sneak by...
 """
 
-import copy
 import timeit
 
 import puzzle.latinsquare as ls
@@ -26,7 +25,8 @@ def from_file(filename, level="(not set)"):
     """Load test cases from file, return as list of dicts.
 
     Puzzle should be formatted as a string on a single line.
-    See puzzle.latinsquare.from_string. Trailing whitespace is stripped.
+    See puzzle.latinsquare.from_string. Trailing whitespace is stripped,
+    and blank lines are skipped (labels still use the file's line numbers).
 
     Args:
         filename: File to read. One line per puzzle.
@@ -43,8 +43,10 @@ def from_file(filename, level="(not set)"):
     with open(filename) as f:
         for line in f:
             i += 1
-            tc = {"puzzle": line.rstrip(), "label": f"{filename}:{i}", "level": level}
-            ret.append(tc)
+            puzzle = line.rstrip()
+            if not puzzle:
+                continue
+            ret.append({"puzzle": puzzle, "label": f"{filename}:{i}", "level": level})
     return ret
 
 
@@ -62,11 +64,10 @@ def has_same_clues(puzzle, solution):
     if puzzle.max_value != solution.max_value:
         return False
 
-    for x in range(puzzle.max_value):
-        for y in range(puzzle.max_value):
-            if not puzzle.is_empty(x, y) and puzzle.get(x, y) != solution.get(x, y):
-                return False
-    return True
+    # Compare the cell snapshots directly, only where puzzle has a clue
+    clues = puzzle.get_cell_values()
+    values = solution.get_cell_values()
+    return all(clue == value for clue, value in zip(clues, values) if clue)
 
 
 class PuzzleTester:
@@ -80,7 +81,8 @@ class PuzzleTester:
 
     Args:
         puzzle_class: Tester will create new instances of this class for
-            the solver. Class should be derived from ConstraintPuzzle.
+            the solver. Class should be derived from LatinSquare (has_same_clues
+            compares puzzles through get_cell_values).
         test_samples: Number of times to repeat each test case. Default is 1.
     """
 
@@ -149,8 +151,8 @@ class PuzzleTester:
         "cheat" by just over-writing all cells with a preset pattern.
 
         Args:
-            test_puzzle: String containing test puzzle, will be converted
-                using puzzle.latinsquare.from_string.
+            test_puzzle: String containing test puzzle, passed straight to
+                puzzle_class (see puzzle.latinsquare.from_string for format).
 
             solver_instance: Instance of a solver class with a solve() method.
 
@@ -159,8 +161,8 @@ class PuzzleTester:
         """
 
         # Initialize puzzle, and make a copy for checking with later
-        puz = self.puzzle_class(starting_grid=ls.from_string(test_puzzle))
-        orig = copy.deepcopy(puz)
+        puz = self.puzzle_class(starting_grid=test_puzzle)
+        orig = puz.copy()
 
         # Call solver and check for cheating
         claimed_solved = solver.solve(puz)
@@ -19,7 +19,7 @@ def bench(function, use_class=sudoku.SudokuPuzzle, setup=""):
 
 # Sanity check
 p = BenchmarkerPuzzle()
-assert [m for m in p.next_empty_cell()] == p.get_all_empty_cells()
+assert tuple(p.next_empty_cell()) == p.get_all_empty_cells()
 
 print("GET EMPTY CELLS")
 bench("p.find_empty_cell()", use_class=BenchmarkerPuzzle)
@@ -1,9 +1,11 @@
 """Unit tests for puzzle.latinsquare classes and functions."""
 
+import copy
 import unittest
 import puzzle.latinsquare as ls
 
 DEFAULT_PUZZLE_SIZE = 9
+DEFAULT_PUZZLE_CELLS = DEFAULT_PUZZLE_SIZE * DEFAULT_PUZZLE_SIZE
 TEST_PUZZLE = [
     [8, 9, 0, 4, 0, 0, 0, 5, 6],
     [1, 4, 0, 3, 5, 0, 0, 9, 0],
@@ -58,12 +60,32 @@ class TestFunctions(unittest.TestCase):
             for i in range(ls.MAX_PUZZLE_SIZE):
                 self.assertEqual(ls.int2char(i), ls.int2char(ls.char2int(ls.int2char(i))))
 
+        # Not a single cell character
+        self.assertRaises(ValueError, ls.char2int, "x")
+        self.assertRaises(ValueError, ls.char2int, "12")
+
+    def test_mask_to_set(self):
+        """mask_to_set converts value bitmasks to sets of values"""
+        self.assertEqual(set(), ls.mask_to_set(0))
+        self.assertEqual({1}, ls.mask_to_set(0b1))
+        self.assertEqual({2, 3, 9}, ls.mask_to_set(0b100000110))
+        self.assertEqual(set(range(1, 26)), ls.mask_to_set((1 << 25) - 1))
+
+    def test_mask_count(self):
+        """mask_count counts the values in a bitmask"""
+        self.assertEqual(0, ls.mask_count(0))
+        self.assertEqual(1, ls.mask_count(0b1))
+        self.assertEqual(3, ls.mask_count(0b100000110))
+        self.assertEqual(25, ls.mask_count((1 << 25) - 1))
+
     def test_count_clues(self):
         """count_clues can count the number of clues in string or list format"""
         self.assertEqual(31, ls.count_clues(TEST_PUZZLE))
         self.assertEqual(31, ls.count_clues(TEST_STRING))
         self.assertEqual(81, ls.count_clues(SOLVED_PUZZLE))
         self.assertEqual(81, ls.count_clues(SOLVED_STRING))
+        self.assertEqual(31, ls.count_clues(TEST_STRING.replace('.', '0')))
+        self.assertEqual(31, ls.count_clues(ls.from_string(TEST_STRING)))
 
     def test_from_string(self):
         """Convert strings to 2D arrays with useful error messages"""
@@ -82,6 +104,7 @@ class TestFunctions(unittest.TestCase):
             self.assertRaises(ValueError, ls.from_string, '2')
             self.assertRaises(ValueError, ls.from_string, '1223')
             self.assertRaises(ValueError, ls.from_string, '')
+            self.assertRaises(ValueError, ls.from_string, '12a.')
 
 
 class TestLatinSquare(unittest.TestCase):
@@ -97,8 +120,8 @@ class TestLatinSquare(unittest.TestCase):
         # Has correct dimensions with default settings
         with self.subTest("Defaults"):
             p = ls.LatinSquare()
-            self.assertEqual(DEFAULT_PUZZLE_SIZE ** 2, p.num_empty_cells())
-            self.assertEqual(DEFAULT_PUZZLE_SIZE ** 2, p.num_cells)
+            self.assertEqual(DEFAULT_PUZZLE_CELLS, p.num_empty_cells())
+            self.assertEqual(DEFAULT_PUZZLE_CELLS, p.num_cells)
             self.assertEqual(set(range(1, DEFAULT_PUZZLE_SIZE + 1)), p.complete_set)
             self.assertEqual(DEFAULT_PUZZLE_SIZE, p.max_value)
 
@@ -123,6 +146,8 @@ class TestLatinSquare(unittest.TestCase):
         # Contradictory arguments raise errors
         with self.subTest("grid_size and starting_grid disagree"):
             self.assertRaises(ValueError, ls.LatinSquare, grid_size=8, starting_grid=TEST_PUZZLE)
+            self.assertRaises(ValueError, ls.LatinSquare, grid_size=8, starting_grid=TEST_STRING)
+            self.assertRaises(ValueError, ls.LatinSquare, starting_grid=TEST_STRING[0:-1])
 
     def test_set(self):
         """Correctly set values and have rules enforced"""
@@ -137,6 +162,13 @@ class TestLatinSquare(unittest.TestCase):
         self.assertRaises(ValueError, self.p.set, 1, 2, 1)
         self.assertRaises(ValueError, self.p.set, 2, 1, 1)
 
+        # Rejected over-write leaves the previous value and constraints in place
+        self.p.set(1, 2, 2)
+        self.assertRaises(ValueError, self.p.set, 1, 1, 2)
+        self.assertEqual(1, self.p.get(1, 1))
+        self.assertEqual(self.p.num_cells - 2, self.p.num_empty_cells())
+        self.assertFalse(1 in self.p.get_allowed_values(1, 5))
+
     def test_get_set_and_clear(self):
         """Correctly get, set and clear value"""
 
@@ -184,11 +216,30 @@ class TestLatinSquare(unittest.TestCase):
         all_empties = [m for m in self.p.next_empty_cell()]
         self.assertEqual(50, len(all_empties))
         self.assertEqual(50, self.p.num_empty_cells())
+        self.assertEqual(tuple(all_empties), self.p.get_all_empty_cells())
+
+        # Snapshot does not change as cells are filled
+        snapshot = self.p.get_all_empty_cells()
+        self.p.set(*snapshot[0], 3)
+        self.assertEqual(50, len(snapshot))
+        self.assertEqual(snapshot[1:], self.p.get_all_empty_cells())
 
         self.p.init_puzzle(SOLVED_PUZZLE)
         all_empties = [m for m in self.p.next_empty_cell()]
         self.assertEqual(0, len(all_empties))
         self.assertEqual(0, self.p.num_empty_cells())
+        self.assertEqual((), self.p.get_all_empty_cells())
+
+    def test_get_mrv_cell(self):
+        """get_mrv_cell returns the first cell with the fewest allowed values"""
+        self.p.init_puzzle(TEST_PUZZLE)
+        cell = self.p.get_mrv_cell()
+        self.assertEqual(next(self.p.next_best_empty_cell()), cell)
+        fewest = min(len(self.p.get_allowed_values(*m)) for m in self.p.next_empty_cell())
+        self.assertEqual(fewest, len(self.p.get_allowed_values(*cell)))
+
+        self.p.init_puzzle(SOLVED_PUZZLE)
+        self.assertEqual((), self.p.get_mrv_cell())
 
     def test_allowed_values(self):
         """Test that is_allowed_value correctly enforces constraints"""
@@ -203,11 +254,27 @@ class TestLatinSquare(unittest.TestCase):
         self.assertFalse(test_value in self.p.get_allowed_values(test_cell[0] + 1, test_cell[1]))
         self.assertFalse(test_value in self.p.get_allowed_values(test_cell[0], test_cell[1] + 1))
 
+        # Bitmask version agrees with the set version
+        bit = 1 << (test_value - 1)
+        self.assertEqual(bit, self.p.get_allowed_mask(*test_cell))
+        self.assertTrue(self.p.get_allowed_mask(*next_cell) & bit)
+        self.assertFalse(self.p.get_allowed_mask(test_cell[0] + 1, test_cell[1]) & bit)
+        for x in range(self.p.max_value):
+            for y in range(self.p.max_value):
+                self.assertEqual(ls.mask_to_set(self.p.get_allowed_mask(x, y)), self.p.get_allowed_values(x, y))
+
+        # Single value test agrees with the set version
+        for x in range(self.p.max_value):
+            for y in range(self.p.max_value):
+                allowed = self.p.get_allowed_values(x, y)
+                for v in range(1, self.p.max_value + 1):
+                    self.assertEqual(v in allowed, self.p.is_allowed_value(x, y, v))
+
     def test_init_puzzle(self):
         """Initialize puzzle with starting clues"""
 
         with self.subTest("Using unsolved puzzles"):
-            for i in [TEST_PUZZLE, ls.from_string(TEST_STRING)]:
+            for i in [TEST_PUZZLE, ls.from_string(TEST_STRING), TEST_STRING]:
                 # Init existing puzzle instance
                 self.p.init_puzzle(i)
                 self.assertEqual(50, self.p.num_empty_cells())
@@ -223,7 +290,7 @@ class TestLatinSquare(unittest.TestCase):
                 self.assertFalse(newp.is_solved())
 
         with self.subTest("Using solved puzzles"):
-            for i in [SOLVED_PUZZLE, ls.from_string(SOLVED_STRING)]:
+            for i in [SOLVED_PUZZLE, ls.from_string(SOLVED_STRING), SOLVED_STRING]:
                 # Init existing puzzle instance
                 self.p.init_puzzle(i)
                 self.assertEqual(0, self.p.num_empty_cells())
@@ -241,6 +308,36 @@ class TestLatinSquare(unittest.TestCase):
         with self.subTest("Bad puzzle init"):
             for i in [TEST_STRING, ls.from_string(SOLVED_STRING)]:
                 self.assertRaises(ValueError, self.p.init_puzzle, i[0:-1])
+            self.assertRaises(ValueError, self.p.init_puzzle, '.' * 16)
+
+        with self.subTest("Wrong size leaves puzzle unchanged"):
+            self.p.init_puzzle(TEST_PUZZLE)
+            before = self.p.get_cell_values()
+            ragged = [row[:] for row in SOLVED_PUZZLE]
+            ragged[-1].pop()
+            for i in ['.' * 16, SOLVED_PUZZLE[:-1], ragged]:
+                self.assertRaises(ValueError, self.p.init_puzzle, i)
+                self.assertEqual(before, self.p.get_cell_values())
+                self.assertEqual(50, self.p.num_empty_cells())
+
+    def test_copy(self):
+        """copy() is independent of the original puzzle"""
+        self.p.init_puzzle(TEST_PUZZLE)
+        c = self.p.copy()
+        self.assertEqual(repr(self.p), repr(c))
+
+        c.set(0, 2, 3)
+        self.assertTrue(self.p.is_empty(0, 2))
+        self.assertTrue(3 in self.p.get_allowed_values(0, 2))
+        self.assertFalse(3 in c.get_allowed_values(0, 3))
+        self.assertEqual(50, self.p.num_empty_cells())
+        self.assertEqual(49, c.num_empty_cells())
+
+        # copy module uses the same fast path
+        for c in (copy.copy(self.p), copy.deepcopy(self.p)):
+            self.assertEqual(repr(self.p), repr(c))
+            c.set(0, 2, 3)
+            self.assertTrue(self.p.is_empty(0, 2))
 
     def test_as_string(self):
         """str and repr representations"""
@@ -252,6 +349,17 @@ class TestLatinSquare(unittest.TestCase):
         self.assertTrue(len(str(self.p)) > 81)
         self.assertEqual(f"LatinSquare(9, '{SOLVED_STRING}')", repr(self.p))
 
+    def test_get_cell_values(self):
+        """get_cell_values is a row-major bytes snapshot of the grid"""
+        self.p.init_puzzle(TEST_PUZZLE)
+        cells = self.p.get_cell_values()
+        self.assertEqual(bytes(v for row in TEST_PUZZLE for v in row), cells)
+
+        # Snapshot does not follow later changes
+        self.p.clear(0, 0)
+        self.assertEqual(8, cells[0])
+        self.assertEqual(0, self.p.get_cell_values()[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -53,8 +53,8 @@ TEST_SOLUTION_STRINGS = [
 
 EASY_PUZZLE = ls.from_string("89.4...5614.35..9.......8..9.....2...8.965.4...1.....5..8.......3..21.7842...6.13")
 EASY_SOLUTION = ls.from_string("893472156146358792275619834954183267782965341361247985518734629639521478427896513")
-EASY_MOVES_LEGAL = [[0, 2, 3], [3, 3, 1], [4, 4, 6], [1, 6, 7], [7, 3, 5], [1, 8, 2], [8, 2, 7]]
-EASY_MOVES_ILLEGAL = [[0, 2, 8], [0, 2, 1], [3, 3, 2], [3, 3, 4], [2, 2, 4], [3, 3, 6], [0, 0, 9]]
+EASY_MOVES_LEGAL = ((0, 2, 3), (3, 3, 1), (4, 4, 6), (1, 6, 7), (7, 3, 5), (1, 8, 2), (8, 2, 7))
+EASY_MOVES_ILLEGAL = ((0, 2, 8), (0, 2, 1), (3, 3, 2), (3, 3, 4), (2, 2, 4), (3, 3, 6), (0, 0, 9))
 
 HARD_PUZZLE = ls.from_string("..8......1..6..49.5......7..7..4.....5.2.6...8..79..1..63.....1..5.73......9..75.")
 HARD_SOLUTION = ls.from_string("498157632137682495526439178671348529359216847842795316763524981915873264284961753")
@@ -74,9 +74,15 @@ MULTI_SOLUTION_STRINGS = [
 
 
 class TestSudokuPuzzle(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build the starting puzzles once, each test gets its own copy"""
+        cls.pristine_p = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_PUZZLE)
+        cls.pristine_s = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_SOLUTION)
+
     def setUp(self):
-        self.p = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_PUZZLE)
-        self.s = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_SOLUTION)
+        self.p = self.pristine_p.copy()
+        self.s = self.pristine_s.copy()
         self.legal_moves = EASY_MOVES_LEGAL
         self.illegal_moves = EASY_MOVES_ILLEGAL
         return
@@ -121,6 +127,53 @@ class TestSudokuPuzzle(unittest.TestCase):
         self.assertRaises(ValueError, self.p.init_puzzle, data)
         return
 
+    def test_copy(self):
+        """copy() includes the box constraints, and is independent of the original"""
+        c = self.p.copy()
+        self.assertTrue(isinstance(c, su.SudokuPuzzle))
+        self.assertEqual(str(self.p), str(c))
+
+        c.set(0, 2, 3)
+        self.assertTrue(self.p.is_empty(0, 2))
+        self.assertFalse(3 in c.get_allowed_values(2, 2))
+        self.assertTrue(3 in self.p.get_allowed_values(2, 2))
+        return
+
+    def test_get_peers(self):
+        """Peers are the other cells in the same row, column and box"""
+        peers = self.p.get_peers(4, 4)
+        self.assertEqual(20, len(peers))
+        self.assertEqual(20, len(set(peers)))
+        self.assertFalse((4, 4) in peers)
+        self.assertTrue((4, 0) in peers)
+        self.assertTrue((0, 4) in peers)
+        self.assertTrue((3, 5) in peers)
+        self.assertFalse((2, 2) in peers)
+
+        for size in (1, 4, 16):
+            with self.subTest(f"Puzzle size = {size}"):
+                p = su.SudokuPuzzle(size)
+                bs = p.box_size
+                for x in range(size):
+                    for y in range(size):
+                        self.assertEqual(3 * size - 2 * bs - 1, len(p.get_peers(x, y)))
+        return
+
+    def test_clear_all(self):
+        """clear_all empties the grid and resets every constraint"""
+        grid = self.s._grid
+        self.s.clear_all()
+        self.assertIs(grid, self.s._grid)  # reset in place, not reallocated
+        self.assertEqual(self.s.num_cells, self.s.num_empty_cells())
+        for x in range(self.s.max_value):
+            for y in range(self.s.max_value):
+                self.assertTrue(self.s.is_empty(x, y))
+                self.assertEqual(self.s.complete_set, self.s.get_allowed_values(x, y))
+
+        self.s.init_puzzle(EASY_SOLUTION)
+        self.assertTrue(self.s.is_solved())
+        return
+
     def test_box_num_toxy(self):
         """Conversion of box numbers to (x,y) positions
 
@@ -162,14 +215,31 @@ class TestSudokuPuzzle(unittest.TestCase):
 
     def test_box_xy_tonum(self):
         """Conversion of x,y cell positions to box numbers"""
-        for x in range(self.p.max_value):
-            for y in range(self.p.max_value):
-                with self.subTest(f"Cage for {x},{y}"):
-                    num = self.p.box_xy_to_num(x, y)
-                    pos = self.p.box_num_to_xy(num)
-                    self.assertEqual(
-                        self.p.box_xy_to_num(x, y), self.p.box_xy_to_num(*pos)
-                    )
+        bs = self.p.box_size
+        for num in range(self.p.max_value):
+            x0, y0 = self.p.box_num_to_xy(num)
+            with self.subTest(f"Cage {num} at {x0},{y0}"):
+                for x in range(x0, x0 + bs):
+                    for y in range(y0, y0 + bs):
+                        self.assertEqual(num, self.p.box_xy_to_num(x, y))
+        return
+
+    def test_out_of_range_cells(self):
+        """Out of range cells raise IndexError and change nothing"""
+        n = self.s.max_value
+
+        def state():
+            masks = tuple(self.s._used_mask(x, y) for x in range(n) for y in range(n))
+            return self.s.get_cell_values(), self.s.num_empty_cells(), masks
+
+        before = state()
+        for x, y in [(0, n), (0, -1), (n, 0), (-1, 0)]:
+            with self.subTest(f"Cell {x},{y}"):
+                self.assertRaises(IndexError, self.s.clear, x, y)
+                self.assertRaises(IndexError, self.s.set, x, y, 1)
+                self.assertRaises(IndexError, self.s.get, x, y)
+                self.assertRaises(IndexError, self.s.is_empty, x, y)
+                self.assertEqual(before, state())
         return
 
     def test_clear_and_set(self):
@@ -232,11 +302,10 @@ class TestSudokuPuzzle(unittest.TestCase):
 
     def test_legal_move(self):
         """Correctly tell us if a move is legal"""
-        for i in range(len(self.legal_moves)):
+        for i, (x, y, value) in enumerate(self.legal_moves):
             with self.subTest(i=i):
-                m = self.legal_moves[i]
-                self.assertEqual(EASY_SOLUTION[m[0]][m[1]], m[2])  # test data error
-                self.assertTrue(m[2] in self.p.get_allowed_values(m[0], m[1]))
+                self.assertEqual(EASY_SOLUTION[x][y], value)  # test data error
+                self.assertTrue(value in self.p.get_allowed_values(x, y))
         return
 
     def test_invalid_move(self):
@@ -247,17 +316,15 @@ class TestSudokuPuzzle(unittest.TestCase):
 
     def test_illegal_moves(self):
         """Correctly tell us if a move is NOT legal"""
-        for i in range(len(self.illegal_moves)):
+        for i, (x, y, value) in enumerate(self.illegal_moves):
             with self.subTest(i=i):
-                m = self.illegal_moves[i]
-                self.assertFalse(m[2] in self.p.get_allowed_values(m[0], m[1]))
+                self.assertFalse(value in self.p.get_allowed_values(x, y))
         return
 
     def test_illegal_set(self):
         """Throw exception if we attempt an illegal move"""
-        for i in range(len(self.illegal_moves)):
+        for i, m in enumerate(self.illegal_moves):
             with self.subTest(i=i):
-                m = self.illegal_moves[i]
                 self.assertRaises(ValueError, self.p.set, *m)
         return
 
@@ -265,14 +332,13 @@ class TestSudokuPuzzle(unittest.TestCase):
         """Correctly tell us if a puzzle grid is or is not valid"""
         self.assertTrue(self.p.is_valid())
 
-        for i in range(len(self.illegal_moves)):
+        for i, (x, y, new_val) in enumerate(self.illegal_moves):
             with self.subTest(i=i):
-                m = list(self.illegal_moves[i])
-                new_val = m.pop()
-                old_val = self.p.get(*m)
-                self.p._grid[m[0]][m[1]] = new_val
+                cell = x * self.p.max_value + y
+                old_val = self.p._grid[cell]
+                self.p._grid[cell] = new_val
                 self.assertFalse(self.p.is_valid())
-                self.p._grid[m[0]][m[1]] = old_val
+                self.p._grid[cell] = old_val
                 self.assertTrue(self.p.is_valid())
         return
 
@@ -286,6 +352,13 @@ class TestSudokuPuzzle(unittest.TestCase):
 
         self.s.set(0, 0, v)
         self.assertTrue(self.s.is_solved())
+        self.assertTrue(self.s.is_solved())
+
+        # Remembered result is not used once the grid changes
+        self.s._grid[0] = self.s._grid[1]
+        self.assertFalse(self.s.is_solved())
+        self.s._grid[0] = v
+        self.assertTrue(self.s.is_solved())
         return
 
     def test_play_legal_game(self):
@@ -363,10 +436,16 @@ class TestSudokuPuzzle(unittest.TestCase):
 class TestSudokuSolver(unittest.TestCase):
     """Test cases for SudokuSolver"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the starting puzzles once, each test gets its own copy"""
+        cls.pristine_p = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_PUZZLE)
+        cls.pristine_s = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_SOLUTION)
+
     def setUp(self):
         """Handy to have an unsolved (p) and already solved puzzle (s) for later tests"""
-        self.p = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_PUZZLE)
-        self.s = su.SudokuPuzzle(su.DEFAULT_SUDOKU_SIZE, EASY_SOLUTION)
+        self.p = self.pristine_p.copy()
+        self.s = self.pristine_s.copy()
         return
 
     def test_backtracking(self):
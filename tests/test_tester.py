@@ -1,5 +1,7 @@
 """Unit tests for puzzle.tester classes and functions."""
 
+import os
+import tempfile
 import unittest
 
 import puzzle.latinsquare as ls
@@ -47,6 +49,17 @@ class TestFunctions(unittest.TestCase):
         tester.add_test_cases(pt.from_file("data/sudoku_9x9/hardest.txt"))
         self.assertEqual(13, tester.num_test_cases())
 
+    def test_from_file_blank_lines(self):
+        """Blank lines are skipped, labels keep the file's line numbers"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "puzzles.txt")
+            with open(filename, "w") as f:
+                f.write(f"{TEST_PUZZLE_STRINGS[0]}\n\n{TEST_PUZZLE_STRINGS[1]}\n\n")
+            cases = pt.from_file(filename)
+        self.assertEqual(2, len(cases))
+        self.assertEqual(TEST_PUZZLE_STRINGS[1], cases[1]["puzzle"])
+        self.assertEqual(f"{filename}:3", cases[1]["label"])
+
 
 class TestPuzzleTester(unittest.TestCase):
     """Tests for the class PuzzleTester using LatinSquare puzzles"""